@@ -99,7 +99,9 @@ def generate_review_copy(
             _apply_highlight(out_page, ann)
 
     src_doc.close()
-    out_doc.save(str(output_path))
+    # Per-page insert_pdf copies shared fonts/images once per page; garbage=4
+    # merges the duplicates and deflate compresses the streams on write.
+    out_doc.save(str(output_path), garbage=4, deflate=True, clean=True)
     out_doc.close()
 
     return output_path
@@ -19,11 +19,21 @@ def _tid(txn_id: str | None) -> str:
     if txn_id:
         return txn_id
     with db.conn() as c:
-        t = db.active(c)
-    if not t:
+        tid = db.active_id(c)
+    if not tid:
         con.print("[red]No transactions. Run:[/] tc new <address>")
         raise typer.Exit(1)
-    return t["id"]
+    return tid
+
+
+def _txn(txn_id: str | None) -> dict:
+    """Full row for --txn (or the active transaction), fetched in one query."""
+    with db.conn() as c:
+        t = db.txn(c, txn_id) if txn_id else db.active(c)
+    if not t:
+        con.print(f"[red]Not found: {txn_id}[/]" if txn_id else "[red]No transactions. Run:[/] tc new <address>")
+        raise typer.Exit(1)
+    return t
 
 
 # ── Core ─────────────────────────────────────────────────────────────────────
@@ -37,7 +47,7 @@ def new(address: str):
     with db.conn() as c:
         c.execute("INSERT INTO txns(id,address,jurisdictions) VALUES(?,?,?)", (tid, address, json.dumps(juris)))
         db.log(c, tid, "created", address)
-    engine.init_gates(tid)
+        engine.init_gates(tid)                          # joins this transaction
     con.print(f"[green]Created[/] {tid} — {address}")
     con.print(f"Jurisdictions: {', '.join(juris)}")
 
@@ -50,7 +60,6 @@ def extract(pdf: Path, form: str = typer.Option(None, "--form", help="CAR form t
     data = engine.extract(str(pdf), form_type=form)
     with db.conn() as c:
         c.execute("UPDATE txns SET data=?, updated=datetime('now','localtime') WHERE id=?", (json.dumps(data), tid))
-    with db.conn() as c:
         db.log(c, tid, "extracted", f"form={form or 'auto'}")
     anchor = (data.get("dates") or {}).get("acceptance")
     if anchor:
@@ -65,14 +74,12 @@ def extract(pdf: Path, form: str = typer.Option(None, "--form", help="CAR form t
 @app.command()
 def status(txn_id: str = typer.Option(None, "--txn")):
     """Transaction dashboard."""
-    tid = _tid(txn_id)
-    with db.conn() as c:
-        t = db.txn(c, tid)
+    t = _txn(txn_id)
+    tid = t["id"]
     gs = engine.gate_rows(tid)
     dls = engine.deadline_rows(tid)
     data = json.loads(t["data"])
     v = sum(1 for g in gs if g["status"] == "verified")
-    today = date.today()
 
     lines = [f"[bold]{t['address']}[/]", f"Phase: {t['phase']}  |  ID: {tid}"]
     if p := (data.get("parties") or {}):
@@ -85,12 +92,8 @@ def status(txn_id: str = typer.Option(None, "--txn")):
     # Next 3 deadlines
     upcoming = []
     for d in dls:
-        if not d["due"]:
-            continue
-        due = date.fromisoformat(d["due"])
-        delta = (due - today).days
-        if delta >= 0:
-            upcoming.append((d["name"], d["due"], delta))
+        if d["days"] is not None and d["days"] >= 0:
+            upcoming.append((d["name"], d["due"], d["days"]))
     if upcoming:
         lines.append("")
         for name, due_str, delta in upcoming[:3]:
@@ -120,10 +123,8 @@ def deadlines(txn_id: str = typer.Option(None, "--txn")):
     tbl.add_column("Type")
     tbl.add_column("Due")
     tbl.add_column("Days")
-    today = date.today()
     for d in engine.deadline_rows(tid):
-        due = date.fromisoformat(d["due"]) if d["due"] else None
-        delta = (due - today).days if due else None
+        delta = d["days"]
         style = "red" if delta is not None and delta < 0 else "yellow" if delta is not None and delta <= 3 else ""
         days_str = str(delta) if delta is not None else "—"
         tbl.add_row(d["did"], d["name"], d["type"], d["due"] or "—", days_str, style=style)
@@ -192,9 +193,15 @@ def verify(gate_id: str, notes: str = "", txn_id: str = typer.Option(None, "--tx
     for item in info.get("what_agent_verifies", []):
         con.print(f"  \u2610 {item}")
     if typer.confirm("\nI verify all items above are confirmed"):
-        engine.verify(tid, gate_id, notes)
-        con.print(f"[green]\u2713 {gate_id} verified[/]")
-        notify.alert(f"Gate {gate_id} verified", info["name"])
+        changed = engine.verify(tid, gate_id, notes)
+        if changed is None:
+            con.print(f"[red]Not found: {gate_id} for transaction {tid}[/]")
+            raise typer.Exit(1)
+        if changed:
+            con.print(f"[green]\u2713 {gate_id} verified[/]")
+            notify.alert(f"Gate {gate_id} verified", info["name"])
+        else:
+            con.print(f"[dim]{gate_id} was already verified — no change.[/]")
     else:
         con.print("[yellow]Cancelled[/]")
 
@@ -216,9 +223,7 @@ def review(gate_id: str, pdf: Path, txn_id: str = typer.Option(None, "--txn")):
 @app.command()
 def taxes(txn_id: str = typer.Option(None, "--txn")):
     """Calculate transfer taxes."""
-    tid = _tid(txn_id)
-    with db.conn() as c:
-        t = db.txn(c, tid)
+    t = _txn(txn_id)
     data = json.loads(t["data"])
     price = (data.get("financial") or {}).get("purchase_price") or typer.prompt("Purchase price", type=float)
     juris = json.loads(t["jurisdictions"])
@@ -236,9 +241,7 @@ def taxes(txn_id: str = typer.Option(None, "--txn")):
 @app.command()
 def checklist(txn_id: str = typer.Option(None, "--txn")):
     """Show jurisdiction compliance checklist."""
-    tid = _tid(txn_id)
-    with db.conn() as c:
-        t = db.txn(c, tid)
+    t = _txn(txn_id)
     for name in json.loads(t["jurisdictions"]):
         j = rules.jurisdiction(name)
         con.print(f"\n[bold]{j['jurisdiction']['name']}[/]")
@@ -268,26 +271,28 @@ def send_email(to: str, subject: str, body: str):
 @app.command()
 def digest():
     """Daily digest — upcoming deadlines and pending gates across all transactions."""
-    today = date.today()
     urgent, upcoming, pending_gates = [], [], []
+    # One query per table across all txns (ordered as before: newest txn first)
     with db.conn() as c:
-        for row in c.execute("SELECT * FROM txns ORDER BY created DESC"):
-            t = dict(row)
-            for d in engine.deadline_rows(t["id"]):
-                if not d["due"]:
-                    continue
-                due = date.fromisoformat(d["due"])
-                delta = (due - today).days
-                if delta < 0:
-                    urgent.append((t["address"], d["name"], f"OVERDUE by {-delta}d"))
-                elif delta <= 3:
-                    urgent.append((t["address"], d["name"], f"In {delta}d"))
-                elif delta <= 14:
-                    upcoming.append((t["address"], d["name"], f"In {delta}d"))
-            for g in engine.gate_rows(t["id"]):
-                if g["status"] == "pending":
-                    info = rules.gate(g["gid"])
-                    pending_gates.append((t["address"], g["gid"], info["name"] if info else "?"))
+        dls = c.execute(
+            f"SELECT t.address, d.name, {engine.DAYS_LEFT} AS days FROM deadlines d JOIN txns t ON t.id=d.txn "
+            "WHERE d.status='pending' AND d.due <= ? "     # plain ISO compare, served by the partial index
+            "ORDER BY t.created DESC, t.id, d.due",
+            (engine.today_jd(), (date.today() + timedelta(days=14)).isoformat())).fetchall()
+        gs = c.execute(
+            "SELECT t.address, g.gid FROM gates g JOIN txns t ON t.id=g.txn "
+            "WHERE g.status='pending' ORDER BY t.created DESC, t.id, g.gid").fetchall()
+    for d in dls:
+        delta = d["days"]
+        if delta < 0:
+            urgent.append((d["address"], d["name"], f"OVERDUE by {-delta}d"))
+        elif delta <= 3:
+            urgent.append((d["address"], d["name"], f"In {delta}d"))
+        else:
+            upcoming.append((d["address"], d["name"], f"In {delta}d"))
+    for g in gs:
+        info = rules.gate(g["gid"])
+        pending_gates.append((g["address"], g["gid"], info["name"] if info else "?"))
 
     if urgent:
         tbl = Table(title="URGENT", style="red")
@@ -362,7 +367,7 @@ def forms():
 def form_diff(form_file: Path):
     """Show fields in a form template (for reviewing updates)."""
     import yaml
-    t = yaml.safe_load(form_file.read_text())
+    t = yaml.load(form_file.read_text(), Loader=rules._Loader)   # libyaml when available; not cached
     f = t["form"]
     con.print(f"[bold]{f['code']} — {f['name']}[/]  v{f.get('version','?')}")
     con.print(f"Last verified: {f.get('last_verified','?')}\n")
@@ -384,6 +389,9 @@ def list_txns():
     """List all transactions."""
     with db.conn() as c:
         rows = c.execute("SELECT * FROM txns ORDER BY created DESC").fetchall()
+        counts = {r["txn"]: (r["verified"], r["total"]) for r in c.execute(
+            "SELECT txn, COUNT(*) AS total, COUNT(*) FILTER (WHERE status='verified') AS verified "
+            "FROM gates GROUP BY txn")}
     if not rows:
         con.print("[dim]No transactions.[/]")
         return
@@ -394,9 +402,8 @@ def list_txns():
     tbl.add_column("Gates", justify="right")
     tbl.add_column("Created")
     for r in rows:
-        gs = engine.gate_rows(r["id"])
-        v = sum(1 for g in gs if g["status"] == "verified")
-        tbl.add_row(r["id"], r["address"], r["phase"], f"{v}/{len(gs)}", r["created"])
+        v, total = counts.get(r["id"], (0, 0))
+        tbl.add_row(r["id"], r["address"], r["phase"], f"{v}/{total}", r["created"])
     con.print(tbl)
 
 
@@ -404,7 +411,7 @@ def list_txns():
 def delete(txn_id: str):
     """Delete a transaction and its gates/deadlines."""
     with db.conn() as c:
-        t = db.txn(c, txn_id)
+        t = c.execute("SELECT address FROM txns WHERE id=?", (txn_id,)).fetchone()
     if not t:
         con.print(f"[red]Not found: {txn_id}[/]")
         raise typer.Exit(1)
@@ -432,11 +439,10 @@ def timeline(txn_id: str = typer.Option(None, "--txn"), weeks: int = 8):
     for d in dls:
         if not d["due"]:
             continue
-        due = date.fromisoformat(d["due"])
-        if due < today - timedelta(days=7) or due > end:
+        delta = d["days"]
+        if delta < -7 or delta > total_days:
             continue
-        offset = max(0, min(bar_width, int((due - today).days / total_days * bar_width)))
-        delta = (due - today).days
+        offset = max(0, min(bar_width, int(delta / total_days * bar_width)))
         color = "red" if delta < 0 else "red" if delta <= 1 else "yellow" if delta <= 5 else "green"
         marker = "│" if delta >= 0 else "X"
         bar = "─" * offset + f"[{color}]{marker}[/{color}]" + "─" * (bar_width - offset)
@@ -451,24 +457,22 @@ def timeline(txn_id: str = typer.Option(None, "--txn"), weeks: int = 8):
 @app.command()
 def export(txn_id: str = typer.Option(None, "--txn"), out: Path = typer.Option(None, "--out")):
     """Export transaction as JSON (backup/integration)."""
-    tid = _tid(txn_id)
-    with db.conn() as c:
-        t = db.txn(c, tid)
-    payload = {
-        "transaction": {**t, "data": json.loads(t["data"]), "jurisdictions": json.loads(t["jurisdictions"])},
-        "gates": engine.gate_rows(tid),
-        "deadlines": engine.deadline_rows(tid),
-        "audit": [],
-    }
+    t = _txn(txn_id)
+    tid = t["id"]
     with db.conn() as c:
-        for r in c.execute("SELECT * FROM audit WHERE txn=? ORDER BY ts", (tid,)):
-            payload["audit"].append(dict(r))
-    text = json.dumps(payload, indent=2, default=str)
+        payload = {
+            "transaction": {**t, "data": json.loads(t["data"]), "jurisdictions": json.loads(t["jurisdictions"])},
+            "gates": db.dicts(c.execute("SELECT * FROM gates WHERE txn=? ORDER BY gid", (tid,))),
+            # Stored columns only — the computed days-left is not part of the backup
+            "deadlines": db.dicts(c.execute("SELECT * FROM deadlines WHERE txn=? ORDER BY due", (tid,))),
+            "audit": db.dicts(c.execute("SELECT * FROM audit WHERE txn=? ORDER BY ts", (tid,))),
+        }
     if out:
-        out.write_text(text)
+        with out.open("w") as fh:                       # encode straight to disk, no full-text copy
+            json.dump(payload, fh, indent=2, default=str)
         con.print(f"[green]Exported to {out}[/]")
     else:
-        con.print(text)
+        con.print(json.dumps(payload, indent=2, default=str))
 
 
 # ── Audit Log ────────────────────────────────────────────────────────────────
@@ -482,9 +486,8 @@ def audit_log(txn_id: str = typer.Option(None, "--txn"), limit: int = 20):
     tbl.add_column("Action")
     tbl.add_column("Detail")
     with db.conn() as c:
-        rows = c.execute("SELECT * FROM audit WHERE txn=? ORDER BY ts DESC LIMIT ?", (tid, limit)).fetchall()
-    for r in rows:
-        tbl.add_row(r["ts"], r["action"], r["detail"])
+        for r in c.execute("SELECT ts, action, detail FROM audit WHERE txn=? ORDER BY ts DESC LIMIT ?", (tid, limit)):
+            tbl.add_row(r["ts"], r["action"], r["detail"])
     con.print(tbl)
 
 
@@ -493,13 +496,10 @@ def audit_log(txn_id: str = typer.Option(None, "--txn"), limit: int = 20):
 @app.command()
 def summary(txn_id: str = typer.Option(None, "--txn")):
     """Full transaction summary for agent reference."""
-    tid = _tid(txn_id)
-    with db.conn() as c:
-        t = db.txn(c, tid)
+    t = _txn(txn_id)
+    tid = t["id"]
     data = json.loads(t["data"])
     gs = engine.gate_rows(tid)
-    dls = engine.deadline_rows(tid)
-    today = date.today()
     v = sum(1 for g in gs if g["status"] == "verified")
 
     con.print(Panel(f"[bold]{t['address']}[/]", title="Transaction Summary"))
@@ -532,14 +532,9 @@ def summary(txn_id: str = typer.Option(None, "--txn")):
 
     overdue = []
     upcoming = []
-    for d in dls:
-        if not d["due"]:
-            continue
-        delta = (date.fromisoformat(d["due"]) - today).days
-        if delta < 0:
-            overdue.append((d, delta))
-        elif delta <= 7:
-            upcoming.append((d, delta))
+    for d in engine.urgent_deadline_rows(tid, 7):
+        delta = d["days"]
+        (overdue if delta < 0 else upcoming).append((d, delta))
     if overdue:
         con.print(f"\n[red bold]OVERDUE ({len(overdue)})[/]")
         for d, delta in overdue:
@@ -556,23 +551,29 @@ def summary(txn_id: str = typer.Option(None, "--txn")):
 def import_txn(file: Path):
     """Restore a transaction from exported JSON."""
     payload = json.loads(file.read_text())
-    t = payload["transaction"]
-    tid = t["id"]
+    # Validate and flatten up front so malformed files fail before touching the DB
+    try:
+        t = payload["transaction"]
+        tid = t["id"]
+        txn_row = (tid, t["address"], t["phase"], json.dumps(t["jurisdictions"]),
+                   json.dumps(t["data"]), t["created"], t["updated"])
+        gate_rows = [(g["txn"], g["gid"], g["status"], g.get("triggered"), g.get("verified"), g.get("notes"))
+                     for g in payload.get("gates", [])]
+        dl_rows = [(d["txn"], d["did"], d["name"], d["type"], d.get("due"), d["status"])
+                   for d in payload.get("deadlines", [])]
+    except (KeyError, TypeError) as e:
+        con.print(f"[red]Invalid export file: missing {e}[/]")
+        raise typer.Exit(1)
     with db.conn() as c:
-        if db.txn(c, tid):
+        if db.exists(c, tid):
             con.print(f"[red]Transaction {tid} already exists.[/]")
             raise typer.Exit(1)
         c.execute(
             "INSERT INTO txns(id,address,phase,jurisdictions,data,created,updated) VALUES(?,?,?,?,?,?,?)",
-            (tid, t["address"], t["phase"], json.dumps(t["jurisdictions"]),
-             json.dumps(t["data"]), t["created"], t["updated"]),
+            txn_row,
         )
-        for g in payload.get("gates", []):
-            c.execute("INSERT OR IGNORE INTO gates(txn,gid,status,triggered,verified,notes) VALUES(?,?,?,?,?,?)",
-                      (g["txn"], g["gid"], g["status"], g.get("triggered"), g.get("verified"), g.get("notes")))
-        for d in payload.get("deadlines", []):
-            c.execute("INSERT OR IGNORE INTO deadlines(txn,did,name,type,due,status) VALUES(?,?,?,?,?,?)",
-                      (d["txn"], d["did"], d["name"], d["type"], d.get("due"), d["status"]))
+        c.executemany("INSERT OR IGNORE INTO gates(txn,gid,status,triggered,verified,notes) VALUES(?,?,?,?,?,?)", gate_rows)
+        c.executemany("INSERT OR IGNORE INTO deadlines(txn,did,name,type,due,status) VALUES(?,?,?,?,?,?)", dl_rows)
         db.log(c, tid, "imported", str(file))
     con.print(f"[green]Imported {tid} — {t['address']}[/]")
 
@@ -596,9 +597,8 @@ def cron():
 @app.command()
 def report(txn_id: str = typer.Option(None, "--txn"), out: Path = typer.Option(None, "--out")):
     """Generate broker compliance report (text)."""
-    tid = _tid(txn_id)
-    with db.conn() as c:
-        t = db.txn(c, tid)
+    t = _txn(txn_id)
+    tid = t["id"]
     data = json.loads(t["data"])
     gs = engine.gate_rows(tid)
     dls = engine.deadline_rows(tid)
@@ -638,16 +638,15 @@ def report(txn_id: str = typer.Option(None, "--txn"), out: Path = typer.Option(N
         mark = "[x]" if g["status"] == "verified" else "[ ]"
         name = info["name"] if info else "?"
         line = f"  {mark} {g['gid']} {name}"
-        if g.get("verified"):
+        if g["verified"]:
             line += f"  (verified {g['verified']})"
         lines.append(line)
     lines.append("")
 
     lines += ["DEADLINES", "-" * 40]
     for d in dls:
-        if not d["due"]:
+        if (delta := d["days"]) is None:
             continue
-        delta = (date.fromisoformat(d["due"]) - today).days
         flag = " ** OVERDUE **" if delta < 0 else " * URGENT *" if delta <= 3 else ""
         lines.append(f"  {d['due']}  {d['name']}  ({delta}d){flag}")
     lines.append("")
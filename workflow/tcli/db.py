@@ -1,5 +1,6 @@
 """SQLite persistence — single file, zero config."""
 import sqlite3
+import threading
 from contextlib import contextmanager
 from os import environ
 from pathlib import Path
@@ -17,30 +18,63 @@ CREATE TABLE IF NOT EXISTS gates(
   txn TEXT, gid TEXT, status TEXT DEFAULT 'pending',
   triggered TEXT, verified TEXT, notes TEXT,
   PRIMARY KEY(txn, gid)
-);
+) WITHOUT ROWID;
 CREATE TABLE IF NOT EXISTS deadlines(
   txn TEXT, did TEXT, name TEXT, type TEXT, due TEXT,
   status TEXT DEFAULT 'pending',
   PRIMARY KEY(txn, did)
-);
+) WITHOUT ROWID;
 CREATE TABLE IF NOT EXISTS audit(
   id INTEGER PRIMARY KEY AUTOINCREMENT, txn TEXT,
   action TEXT, detail TEXT,
   ts TEXT DEFAULT(datetime('now','localtime'))
-);"""
+);
+CREATE INDEX IF NOT EXISTS ix_txns_created ON txns(created);
+CREATE INDEX IF NOT EXISTS ix_audit_txn_ts ON audit(txn, ts);
+CREATE INDEX IF NOT EXISTS ix_deadlines_txn_due ON deadlines(txn, due);
+CREATE INDEX IF NOT EXISTS ix_deadlines_pending_due ON deadlines(due) WHERE status='pending';
+CREATE INDEX IF NOT EXISTS ix_gates_pending ON gates(txn, gid) WHERE status='pending';"""
 
 
-@contextmanager
-def conn():
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
     DB.parent.mkdir(parents=True, exist_ok=True)
     c = sqlite3.connect(str(DB))
     c.row_factory = sqlite3.Row
+    # WAL lets the tmux panes read while another command writes; NORMAL sync is safe under WAL
+    c.executescript(
+        "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY;"
+        "PRAGMA mmap_size=268435456; PRAGMA cache_size=-65536;"
+    )
     c.executescript(SCHEMA)
+    return c
+
+
+@contextmanager
+def conn():
+    """Per-thread shared connection. Nested blocks join the outermost transaction."""
+    c = getattr(_local, "c", None)
+    if c is None:
+        c = _local.c = _connect()
+    depth = _local.depth = getattr(_local, "depth", 0) + 1
     try:
         yield c
-        c.commit()
+        if depth == 1:
+            c.commit()
+    except BaseException:
+        if depth == 1:
+            c.rollback()
+        raise
     finally:
-        c.close()
+        _local.depth -= 1
+
+
+def dicts(cur) -> list[dict]:
+    """Materialize a cursor as plain dicts, reading the column names once."""
+    keys = [d[0] for d in cur.description]
+    return [dict(zip(keys, r)) for r in cur]
 
 
 def txn(c, tid):
@@ -53,5 +87,14 @@ def active(c):
     return dict(r) if r else None
 
 
+def active_id(c) -> str | None:
+    r = c.execute("SELECT id FROM txns ORDER BY created DESC LIMIT 1").fetchone()
+    return r[0] if r else None
+
+
+def exists(c, tid) -> bool:
+    return c.execute("SELECT 1 FROM txns WHERE id=?", (tid,)).fetchone() is not None
+
+
 def log(c, txn_id: str, action: str, detail: str = ""):
     c.execute("INSERT INTO audit(txn,action,detail) VALUES(?,?,?)", (txn_id, action, detail))
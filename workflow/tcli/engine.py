@@ -1,5 +1,5 @@
 """Deadline calculation, gate management, Claude contract extraction."""
-import json, base64
+import json, base64, sqlite3
 from datetime import date, timedelta
 from . import db, rules
 
@@ -35,100 +35,134 @@ def calc_deadlines(txn_id: str, anchor: date, data: dict):
     if hoa := data.get("hoa_document_delivery"):
         resolved["hoa_document_delivery_date"] = date.fromisoformat(hoa)
 
+    rows = []
+    for dl in rules.deadlines():
+        did, due = dl["id"], None
+
+        if dl.get("is_anchor"):
+            due = anchor
+        elif did == "DL-060" and "DL-060" in resolved:
+            due = resolved["DL-060"]
+        elif dl.get("fixed_date") and "DL-060" in resolved:   # 1099-S
+            due = date(resolved["DL-060"].year + 1, 1, 31)
+        elif dl.get("fixed_years") and "DL-060" in resolved:
+            coe = resolved["DL-060"]
+            due = coe.replace(year=coe.year + dl["fixed_years"])
+        elif "default_offset_days" in dl or "fixed_days" in dl:
+            ref = dl.get("offset_from", "DL-000")
+            base = resolved.get(ref)
+            if not base:
+                continue
+            days = cont.get(DL_KEY.get(did)) or dl.get("default_offset_days") or dl.get("fixed_days", 0)
+            if days is None:
+                continue
+            biz = dl.get("day_type") == "business_days"
+            if dl.get("direction") == "before":
+                days = -abs(days)
+            due = add_days(base, days, biz)
+
+        if due:
+            resolved[did] = due
+            rows.append((txn_id, did, dl["name"], dl["type"], due.isoformat(), "pending"))
+
     with db.conn() as c:
-        for dl in rules.deadlines():
-            did, due = dl["id"], None
-
-            if dl.get("is_anchor"):
-                due = anchor
-            elif did == "DL-060" and "DL-060" in resolved:
-                due = resolved["DL-060"]
-            elif dl.get("fixed_date") and "DL-060" in resolved:   # 1099-S
-                due = date(resolved["DL-060"].year + 1, 1, 31)
-            elif dl.get("fixed_years") and "DL-060" in resolved:
-                coe = resolved["DL-060"]
-                due = coe.replace(year=coe.year + dl["fixed_years"])
-            elif "default_offset_days" in dl or "fixed_days" in dl:
-                ref = dl.get("offset_from", "DL-000")
-                base = resolved.get(ref)
-                if not base:
-                    continue
-                days = cont.get(DL_KEY.get(did)) or dl.get("default_offset_days") or dl.get("fixed_days", 0)
-                if days is None:
-                    continue
-                biz = dl.get("day_type") == "business_days"
-                if dl.get("direction") == "before":
-                    days = -abs(days)
-                due = add_days(base, days, biz)
-
-            if due:
-                resolved[did] = due
-                c.execute(
-                    "INSERT OR REPLACE INTO deadlines VALUES(?,?,?,?,?,?)",
-                    (txn_id, did, dl["name"], dl["type"], due.isoformat(), "pending"),
-                )
+        c.executemany("INSERT OR REPLACE INTO deadlines VALUES(?,?,?,?,?,?)", rows)
 
 # ── Gates ────────────────────────────────────────────────────────────────────
 
 def init_gates(txn_id: str):
     with db.conn() as c:
-        for g in rules.gates():
-            c.execute("INSERT OR IGNORE INTO gates(txn,gid) VALUES(?,?)", (txn_id, g["id"]))
+        c.executemany("INSERT OR IGNORE INTO gates(txn,gid) VALUES(?,?)", [(txn_id, g["id"]) for g in rules.gates()])
 
 
-def verify(txn_id: str, gate_id: str, notes: str = ""):
+def verify(txn_id: str, gate_id: str, notes: str = "") -> bool | None:
+    """Sign off a gate. Returns True if written, False if already verified with the
+    same notes (original sign-off kept), None if the txn has no such gate."""
     with db.conn() as c:
-        c.execute(
+        cur = c.execute(
             "UPDATE gates SET status='verified', verified=datetime('now','localtime'), notes=? "
-            "WHERE txn=? AND gid=?",
-            (notes, txn_id, gate_id),
+            "WHERE txn=? AND gid=? AND (status<>'verified' OR notes IS NOT ?)",
+            (notes, txn_id, gate_id, notes),
         )
+        if not cur.rowcount:
+            found = c.execute("SELECT 1 FROM gates WHERE txn=? AND gid=?", (txn_id, gate_id)).fetchone()
+            return False if found else None
         db.log(c, txn_id, "gate_verified", gate_id)
+    return True
+
+
+# Row helpers return sqlite3.Row as-is (key access, no per-row dict copy)
+
+def gate_rows(txn_id: str) -> list[sqlite3.Row]:
+    with db.conn() as c:
+        return c.execute("SELECT * FROM gates WHERE txn=? ORDER BY gid", (txn_id,)).fetchall()
 
 
-def gate_rows(txn_id: str) -> list[dict]:
+def blocking_gate_rows(txn_id: str) -> list[sqlite3.Row]:
+    """Gates not yet verified (filtered in SQL)."""
     with db.conn() as c:
-        return [dict(r) for r in c.execute("SELECT * FROM gates WHERE txn=? ORDER BY gid", (txn_id,))]
+        return c.execute(
+            "SELECT * FROM gates WHERE txn=? AND status<>'verified' ORDER BY gid", (txn_id,)).fetchall()
+
+
+# Whole days from today until due (negative if past), NULL when due is unset.
+# Bind today_jd() for the ? so SQLite doesn't re-parse 'now' on every row.
+DAYS_LEFT = "CAST(julianday(due) - ? AS INTEGER)"
+
+
+def today_jd() -> float:
+    """Julian day number of local midnight today (what julianday('YYYY-MM-DD') returns)."""
+    return date.today().toordinal() + 1721424.5
 
 
-def deadline_rows(txn_id: str) -> list[dict]:
+def deadline_rows(txn_id: str) -> list[sqlite3.Row]:
     with db.conn() as c:
-        return [dict(r) for r in c.execute("SELECT * FROM deadlines WHERE txn=? ORDER BY due", (txn_id,))]
+        return c.execute(f"SELECT *, {DAYS_LEFT} AS days FROM deadlines WHERE txn=? ORDER BY due",
+                         (today_jd(), txn_id)).fetchall()
+
+
+def urgent_deadline_rows(txn_id: str, within_days: int = 7) -> list[sqlite3.Row]:
+    """Overdue deadlines plus those due in the next `within_days` (window filtered in SQL)."""
+    horizon = (date.today() + timedelta(days=within_days)).isoformat()
+    with db.conn() as c:
+        return c.execute(f"SELECT *, {DAYS_LEFT} AS days FROM deadlines WHERE txn=? AND due <= ? ORDER BY due",
+                         (today_jd(), txn_id, horizon)).fetchall()
 
 # ── Phase Advancement ────────────────────────────────────────────────────────
 
 PHASE_ORDER = [p["id"] for p in rules.phases()]
 
-def can_advance(txn_id: str) -> tuple[bool, list[str]]:
-    """Check if all gates for current phase are verified."""
+def _phase(txn_id: str) -> str:
     with db.conn() as c:
-        t = db.txn(c, txn_id)
-    phase = t["phase"]
-    phase_def = next((p for p in rules.phases() if p["id"] == phase), None)
-    if not phase_def:
+        return c.execute("SELECT phase FROM txns WHERE id=?", (txn_id,)).fetchone()["phase"]
+
+
+def can_advance(txn_id: str, phase: str | None = None) -> tuple[bool, list[str]]:
+    """Check if all gates for current phase are verified."""
+    phase = phase or _phase(txn_id)
+    if not rules.phase(phase):
         return False, ["Unknown phase"]
     blocking = []
-    for g in gate_rows(txn_id):
+    for g in blocking_gate_rows(txn_id):
         info = rules.gate(g["gid"])
-        if info and info["phase"] == phase and g["status"] != "verified" and info["type"] == "HARD_GATE":
+        if info and info["phase"] == phase and info["type"] == "HARD_GATE":
             blocking.append(f"{g['gid']}: {info['name']}")
     return len(blocking) == 0, blocking
 
 
 def advance_phase(txn_id: str) -> str | None:
     """Move to next phase if gates allow. Returns new phase or None."""
-    ok, blocking = can_advance(txn_id)
+    phase = _phase(txn_id)
+    ok, blocking = can_advance(txn_id, phase)
     if not ok:
         return None
-    with db.conn() as c:
-        t = db.txn(c, txn_id)
-    idx = PHASE_ORDER.index(t["phase"]) if t["phase"] in PHASE_ORDER else -1
+    idx = PHASE_ORDER.index(phase) if phase in PHASE_ORDER else -1
     if idx + 1 >= len(PHASE_ORDER):
         return None
     new_phase = PHASE_ORDER[idx + 1]
     with db.conn() as c:
         c.execute("UPDATE txns SET phase=?, updated=datetime('now','localtime') WHERE id=?", (new_phase, txn_id))
-        db.log(c, txn_id, "phase_advanced", f"{t['phase']} -> {new_phase}")
+        db.log(c, txn_id, "phase_advanced", f"{phase} -> {new_phase}")
     return new_phase
 
 # ── Extraction ───────────────────────────────────────────────────────────────
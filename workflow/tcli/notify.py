@@ -1,5 +1,8 @@
 """Email (SMTP) and push notifications (Pushover / ntfy)."""
-import os, smtplib
+import atexit, os, smtplib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cache
 from email.mime.text import MIMEText
 
 import httpx
@@ -9,38 +12,84 @@ def _env(k, default=""):
     return os.environ.get(k, default)
 
 
-def email(to: str, subject: str, body: str, html=False):
+@cache
+def _client() -> httpx.Client:
+    """Shared keep-alive client — repeat pushes reuse the TCP/TLS connection."""
+    c = httpx.Client(timeout=10.0)
+    atexit.register(c.close)
+    return c
+
+
+@contextmanager
+def smtp_session():
+    """One authenticated SMTP connection (STARTTLS + login once) for any number of sends."""
+    with smtplib.SMTP(_env("TC_SMTP_HOST", "smtp.gmail.com"), int(_env("TC_SMTP_PORT", "587"))) as s:
+        s.starttls()
+        s.login(_env("TC_SMTP_USER"), _env("TC_SMTP_PASS"))
+        yield s
+
+
+def _message(to: str, subject: str, body: str, html=False) -> MIMEText:
     msg = MIMEText(body, "html" if html else "plain")
     msg["Subject"] = subject
     msg["From"] = _env("TC_SMTP_FROM") or _env("TC_SMTP_USER")
     msg["To"] = to
-    with smtplib.SMTP(_env("TC_SMTP_HOST", "smtp.gmail.com"), int(_env("TC_SMTP_PORT", "587"))) as s:
-        s.starttls()
-        s.login(_env("TC_SMTP_USER"), _env("TC_SMTP_PASS"))
-        s.send_message(msg)
+    return msg
 
 
-def push(title: str, body: str, priority: int = 0, url: str = ""):
+def email(to: str, subject: str, body: str, html=False):
+    with smtp_session() as s:
+        s.send_message(_message(to, subject, body, html))
+
+
+def email_many(recipients: list[str], subject: str, body: str, html=False):
+    """Send the same message to each recipient over a single SMTP session."""
+    with smtp_session() as s:
+        for to in recipients:
+            s.send_message(_message(to, subject, body, html))
+
+
+# Alerts drain in the background; interpreter exit joins the pool, so none are dropped
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tc-notify")
+
+
+def _push_calls(title: str, body: str, priority: int = 0, url: str = "") -> list:
+    """One zero-arg sender per configured push provider."""
+    http, calls = _client(), []
     if tok := _env("TC_PUSHOVER_TOKEN"):
-        httpx.post("https://api.pushover.net/1/messages.json", data={
+        calls.append(lambda: http.post("https://api.pushover.net/1/messages.json", data={
             "token": tok, "user": _env("TC_PUSHOVER_USER"),
             "title": title, "message": body, "priority": min(priority, 1), "url": url,
-        })
+        }))
     if topic := _env("TC_NTFY_TOPIC"):
         hdrs = {"Title": title, "Priority": str(max(1, min(5, priority + 3)))}
         if url:
             hdrs["Click"] = url
-        httpx.post(f"https://ntfy.sh/{topic}", headers=hdrs, content=body.encode())
+        calls.append(lambda: http.post(f"https://ntfy.sh/{topic}", headers=hdrs, content=body.encode()))
+    return calls
 
 
-def alert(title: str, body: str, to: str = "", **kw):
-    """Best-effort send to all configured channels."""
+def push(title: str, body: str, priority: int = 0, url: str = ""):
+    calls = _push_calls(title, body, priority, url)
+    # Providers are independent — extras go to the pool so latency is the max, not the sum
+    futures = [_pool.submit(call) for call in calls[1:]]
+    if calls:
+        calls[0]()
+    for f in futures:
+        f.result()
+
+
+def _quietly(fn, *args, **kw):
     try:
-        push(title, body, **kw)
+        fn(*args, **kw)
     except Exception:
         pass
+
+
+def alert(title: str, body: str, to: str = "", **kw):
+    """Best-effort send to all configured channels (returns without waiting)."""
+    # Each provider is its own task; workers never wait on the pool, so it can't deadlock
+    for call in _push_calls(title, body, **kw):
+        _pool.submit(_quietly, call)
     if to:
-        try:
-            email(to, title, body)
-        except Exception:
-            pass
+        _pool.submit(_quietly, email, to, title, body)
@@ -1,5 +1,6 @@
 """Agent-only PDF review copies with color-coded highlights."""
 import fitz
+from collections import defaultdict
 from pathlib import Path
 from . import rules
 
@@ -47,13 +48,13 @@ def review_copy(src_pdf: str, gate_id: str, out_dir: Path, highlights: list[dict
     _cover(out, g)
 
     if highlights:
-        pages = sorted({h["page"] for h in highlights})
-        for i in pages:
+        by_page = defaultdict(list)
+        for h in highlights:
+            by_page[h["page"]].append(h)
+        for i in sorted(by_page):
             pg = out.new_page(width=src[i].rect.width, height=src[i].rect.height)
             pg.show_pdf_page(pg.rect, src, i)
-            for h in highlights:
-                if h["page"] != i:
-                    continue
+            for h in by_page[i]:
                 r = fitz.Rect(h["rect"])
                 rgb = COLORS.get(h.get("color", "YELLOW"), COLORS["YELLOW"])
                 a = pg.add_highlight_annot(r)
@@ -63,15 +64,21 @@ def review_copy(src_pdf: str, gate_id: str, out_dir: Path, highlights: list[dict
                 if h.get("note"):
                     pg.insert_text((r.x1 + 4, r.y0 + 10), h["note"], fontsize=7, fontname="helv", color=(0.3, 0.3, 0.3))
     else:
-        for i in range(len(src)):
-            pg = out.new_page(width=src[i].rect.width, height=src[i].rect.height)
-            pg.show_pdf_page(pg.rect, src, i)
-            pg.draw_rect(fitz.Rect(0, 0, pg.rect.width, 22), color=COLORS["YELLOW"], fill=COLORS["YELLOW"])
-            pg.insert_text((8, 15), f"AGENT REVIEW — {gate_id} — Page {i+1}/{len(src)}", fontsize=8, fontname="helv", color=(0.3, 0.3, 0.3))
+        # insert_pdf copies page objects directly; show_pdf_page would wrap each one as a new XObject.
+        # Links/annots/widgets are dropped so the copy stays flat, as show_pdf_page left it.
+        out.insert_pdf(src, links=False, annots=False, widgets=False)
+        n = len(src)
+        for i, pg in enumerate(out.pages(1)):
+            # Copied pages keep /Rotate; map the top-of-visible-page banner into unrotated page space
+            m = pg.derotation_matrix
+            pg.draw_rect(fitz.Rect(0, 0, pg.rect.width, 22) * m, color=COLORS["YELLOW"], fill=COLORS["YELLOW"])
+            pg.insert_text(fitz.Point(8, 15) * m, f"AGENT REVIEW — {gate_id} — Page {i+1}/{n}",
+                           fontsize=8, fontname="helv", color=(0.3, 0.3, 0.3), rotate=pg.rotation)
 
+    src.close()   # pages are already copied into out
     out_path = out_dir / f"{gate_id}_review.pdf"
     out_dir.mkdir(parents=True, exist_ok=True)
-    out.save(str(out_path))
-    src.close()
+    # garbage=4 merges resources duplicated per page; deflate compresses streams
+    out.save(str(out_path), garbage=4, deflate=True, clean=True)
     out.close()
     return out_path
@@ -1,15 +1,42 @@
 """YAML rule loading, jurisdiction resolution, tax calculation."""
+import hashlib, os, pickle
 import yaml
 from functools import cache
 from pathlib import Path
 
+from . import db
+
+try:
+    from yaml import CSafeLoader as _Loader             # libyaml, ~10x faster
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 ROOT = Path(__file__).resolve().parent.parent          # tc/ -> workflow/
 JURIS_DIR = ROOT.parent / "jurisdictions"              # -> TransactionCoordinator/jurisdictions/
+CACHE_DIR = db.DB.parent / "cache"
 
 
 @cache
 def _load(path: Path):
-    return yaml.safe_load(path.read_text())
+    """Parse a rules YAML, reusing a pickled copy while the file is unchanged."""
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    pkl = CACHE_DIR / f"{path.stem}-{hashlib.sha1(str(path).encode()).hexdigest()[:12]}.pkl"
+    try:
+        cached_stamp, data = pickle.loads(pkl.read_bytes())
+        if cached_stamp == stamp:
+            return data
+    except Exception:
+        pass                                           # missing, stale format, or corrupt
+    data = yaml.load(path.read_text(), Loader=_Loader)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = pkl.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(pickle.dumps((stamp, data), protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp, pkl)
+    except OSError:
+        pass
+    return data
 
 
 def phases():    return _load(ROOT / "phases.yaml")["phases"]
@@ -17,8 +44,22 @@ def gates():     return _load(ROOT / "agent_verification_gates.yaml")["gates"]
 def deadlines(): return _load(ROOT / "deadlines.yaml")["deadlines"]
 
 
+@cache
+def _gates_by_id() -> dict[str, dict]:
+    return {g["id"]: g for g in gates()}
+
+
+@cache
+def _phases_by_id() -> dict[str, dict]:
+    return {p["id"]: p for p in phases()}
+
+
 def gate(gid: str) -> dict | None:
-    return next((g for g in gates() if g["id"] == gid), None)
+    return _gates_by_id().get(gid)
+
+
+def phase(pid: str) -> dict | None:
+    return _phases_by_id().get(pid)
 
 
 def jurisdiction(name: str):